@@ -33,23 +33,24 @@ async def seed():
     await db.orders.delete_many({})
 
     # Insert products
-    result = await db.products.insert_many(sample_products)
+    result = await db.products.insert_many(sample_products, ordered=False)
     print(f"✅ Inserted {len(result.inserted_ids)} products.")
 
-    # Insert flat orders (user_id, product_id, quantity)
-    count = 0
+    # Build flat orders (user_id, product_id, quantity) and insert in one batch
+    created_at = datetime.now(timezone.utc)
+    orders = []
     for i in range(10):  # 10 users
         user_id = f"user_{i}"
         for _ in range(random.randint(1, 3)):
-            product_id = str(random.choice(result.inserted_ids))
-            quantity = random.randint(1, 5)
-            await db.orders.insert_one({
-            "user_id": user_id,
-            "product_id": product_id,
-            "quantity": quantity,
-            "created_at": datetime.now(timezone.utc)
-   })
-            count += 1
+            orders.append({
+                "user_id": user_id,
+                "product_id": random.choice(result.inserted_ids),
+                "quantity": random.randint(1, 5),
+                "created_at": created_at
+            })
+
+    await db.orders.insert_many(orders, ordered=False)
+    count = len(orders)
 
     print(f"✅ Inserted {count} orders.")
     client.close()
@@ -3,13 +3,14 @@ MongoDB database connection and configuration module.
 Handles connection lifecycle and provides database access.
 """
 
+import asyncio
 import logging
 import os
 from typing import Optional
 
 from dotenv import load_dotenv
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo.errors import ConnectionFailure
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo.errors import ConnectionFailure, OperationFailure
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -18,6 +19,12 @@ logger = logging.getLogger(__name__)
 mongo_client: Optional[AsyncIOMotorClient] = None
 database: Optional[AsyncIOMotorDatabase] = None
 
+# Indexes superseded by compound indexes; dropped from existing deployments
+LEGACY_INDEXES = {
+    "products": ["size_1"],
+    "orders": ["user_id_1", "created_at_1", "user_id_1_created_at_-1", "user_created_desc"],
+}
+
 async def connect_to_mongo() -> None:
     """
     Establish connection to MongoDB.
@@ -32,14 +39,17 @@ async def connect_to_mongo() -> None:
         if not mongo_uri:
             raise ValueError("MONGODB_URI environment variable is required")
 
-        # MongoDB client with pool settings
+        # MongoDB client with pool settings (pool size tunable per environment)
         mongo_client = AsyncIOMotorClient(
             mongo_uri,
-            maxPoolSize=10,
-            minPoolSize=1,
-            maxIdleTimeMS=45000,
-            waitQueueMultiple=10,
-            waitQueueTimeoutMS=10000
+            maxPoolSize=int(os.getenv("MAX_POOL_SIZE", 200)),
+            minPoolSize=int(os.getenv("MIN_POOL_SIZE", 20)),  # Warm connections absorb order bursts
+            maxIdleTimeMS=300_000,
+            waitQueueTimeoutMS=10_000,
+            serverSelectionTimeoutMS=3_000,
+            socketTimeoutMS=int(os.getenv("SOCKET_TIMEOUT_MS", 5_000)),
+            retryWrites=True,
+            retryReads=True
         )
 
         await mongo_client.admin.command("ping")  # Check connectivity
@@ -47,9 +57,11 @@ async def connect_to_mongo() -> None:
 
         await create_indexes()
 
-        # Confirm seed data presence
-        product_count = await database.products.count_documents({})
-        order_count = await database.orders.count_documents({})
+        # Confirm seed data presence (metadata counts, fetched concurrently)
+        product_count, order_count = await asyncio.gather(
+            database.products.estimated_document_count(),
+            database.orders.estimated_document_count()
+        )
         logger.info(f"DB Connected: {db_name} | Products: {product_count} | Orders: {order_count}")
 
     except ConnectionFailure as e:
@@ -65,14 +77,26 @@ async def create_indexes() -> None:
         return
 
     try:
-        await database.products.create_index("name")
-        await database.products.create_index("size")
+        await database.products.create_index("name")  # Prefix (anchored regex) lookups
+        # Serves size-filtered listings: equality on size, sort on _id, then name prefix range (ESR)
+        await database.products.create_index(
+            [("size", 1), ("_id", 1), ("name", 1)], name="size_id_name"
+        )
         await database.products.create_index([("name", "text")])
 
-        await database.orders.create_index("user_id")
         await database.orders.create_index("product_id")
-        await database.orders.create_index("created_at")
-        await database.orders.create_index([("user_id", 1), ("created_at", -1)])
+        # Serves list_user_orders: equality on user_id, sort and keyset seek on (created_at, _id) desc
+        await database.orders.create_index(
+            [("user_id", 1), ("created_at", -1), ("_id", -1)], name="user_created_id_desc"
+        )
+
+        # Dropped only once their replacements exist, so queries are never left unindexed
+        for collection_name, index_names in LEGACY_INDEXES.items():
+            for index_name in index_names:
+                try:
+                    await database[collection_name].drop_index(index_name)
+                except OperationFailure:
+                    pass  # Already absent
 
         logger.info("Database indexes created successfully")
     except Exception as e:
@@ -91,6 +115,6 @@ def get_database() -> AsyncIOMotorDatabase:
         raise ConnectionError("MongoDB not connected. Call connect_to_mongo() first.")
     return database
 
-def get_collection(name: str):
-    """Return a named collection from the active database."""
+def get_collection(name: str) -> AsyncIOMotorCollection:
+    """Return a named (Motor, non-blocking) collection from the active database."""
     return get_database()[name]
@@ -14,10 +14,11 @@ load_dotenv()
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from db import connect_to_mongo, close_mongo_connection
 from routers import products, orders
+from services.order_service import get_order_batcher
 
 # Production logging configuration
 logging.basicConfig(
@@ -38,6 +39,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         await connect_to_mongo()
         logger.info("✅ Database connection established")
         
+        get_order_batcher().start()
+        
         yield
         
     except Exception as e:
@@ -45,6 +48,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         raise
     finally:
         logger.info("🔄 Shutting down application")
+        await get_order_batcher().stop()
         await close_mongo_connection()
         logger.info("✅ Application shutdown complete")
 
@@ -55,24 +59,30 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,  # Rust-backed JSON encoding for all responses
     lifespan=lifespan
 )
 
 # CORS configuration - optimized for API-only deployment
-# Since you're not serving a frontend, this allows external API access
+# ALLOWED_ORIGINS is a comma-separated list; defaults to allowing any origin
+allowed_origins = [
+    origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "*").split(",") if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for API access
+    allow_origins=allowed_origins,
     allow_credentials=False,  # Not needed for API-only
     allow_methods=["GET", "POST"],  # Only methods you actually use
-    allow_headers=["*"],
+    allow_headers=["content-type", "authorization"],  # Only headers clients send
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # Global exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     logger.warning(f"HTTP Exception: {exc.status_code} - {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail, "status_code": exc.status_code}
     )
@@ -80,7 +90,7 @@ async def http_exception_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.error(f"Unexpected error: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error", "status_code": 500}
     )
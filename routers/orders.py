@@ -4,27 +4,29 @@ Implements create and list operations with user-specific filtering.
 """
 
 import logging
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Query, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response, status
 
 from schemas.order import OrderIn, OrderOut
-from services.order_service import OrderService
-from utils.pagination import PaginationParams
+from services.order_service import OrderService, get_order_service
+from utils.pagination import PaginationParams, encode_cursor
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["orders"])
 
 
 @router.post("/orders", status_code=status.HTTP_201_CREATED, response_model=OrderOut)
-async def create_order(order: OrderIn) -> OrderOut:
+async def create_order(
+    order: OrderIn,
+    service: OrderService = Depends(get_order_service)
+) -> OrderOut:
     """
     Create a new order in the system.
     """
     try:
         logger.info(f"Creating new order for user: {order.user_id}")
         
-        service = OrderService()
         created_order = await service.create_order(order)
 
         logger.info(f"Order created successfully with ID: {created_order.id}")
@@ -45,23 +47,34 @@ async def create_order(order: OrderIn) -> OrderOut:
 
 @router.get("/orders/{user_id}", status_code=status.HTTP_200_OK, response_model=List[OrderOut])
 async def list_user_orders(
+    response: Response,
     user_id: str = Path(..., description="User ID to retrieve orders for"),
     limit: int = Query(10, ge=1, le=100, description="Number of orders to return"),
-    offset: int = Query(0, ge=0, description="Number of orders to skip")
+    offset: int = Query(0, ge=0, description="Number of orders to skip (ignored when 'after' is set)"),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    service: OrderService = Depends(get_order_service)
 ) -> List[OrderOut]:
     """
     Retrieve a list of orders for a specific user with pagination.
+    When a full page is returned, the X-Next-Cursor header holds the cursor for the next page.
     """
     try:
         logger.info(f"Listing orders for user: {user_id}")
 
-        pagination = PaginationParams(limit=limit, offset=offset)
-        service = OrderService()
+        pagination = PaginationParams(limit=limit, offset=offset, after=after)
         orders = await service.list_user_orders(user_id, pagination)
 
+        if len(orders) == limit:
+            last = orders[-1]
+            response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+
         logger.info(f"Retrieved {len(orders)} orders for user {user_id}")
         return orders
 
+    except ValueError as e:
+        logger.warning(f"Order listing validation error for user {user_id}: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     except Exception as e:
         logger.error(f"Order listing failed for user {user_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to retrieve orders: {str(e)}")
@@ -6,11 +6,11 @@ Implements create and list operations with comprehensive filtering and paginatio
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Query, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 
 from schemas.product import ProductIn, ProductOut
-from services.product_service import ProductService
+from services.product_service import ProductService, get_product_service
 from utils.pagination import PaginationParams
 
 logger = logging.getLogger(__name__)
@@ -18,7 +18,10 @@ router = APIRouter(tags=["products"])
 
 
 @router.post("/products", status_code=status.HTTP_201_CREATED, response_model=ProductOut)
-async def create_product(product: ProductIn) -> ProductOut:
+async def create_product(
+    product: ProductIn,
+    service: ProductService = Depends(get_product_service)
+) -> ProductOut:
     """
     Create a new product in the system.
     
@@ -34,7 +37,6 @@ async def create_product(product: ProductIn) -> ProductOut:
     try:
         logger.info(f"Creating new product: {product.name}")
         
-        service = ProductService()
         created_product = await service.create_product(product)
         
         logger.info(f"Product created successfully with ID: {created_product.id}")
@@ -54,43 +56,64 @@ async def create_product(product: ProductIn) -> ProductOut:
         )
 
 
-@router.get("/products", status_code=status.HTTP_200_OK, response_model=List[ProductOut])
+@router.get(
+    "/products",
+    status_code=status.HTTP_200_OK,
+    response_model=None,  # Rows are already in ProductOut shape; skip re-validation
+    responses={status.HTTP_200_OK: {"model": List[ProductOut]}},
+)
 async def list_products(
-    name: Optional[str] = Query(None, description="Filter by product name (supports partial search)"),
+    name: Optional[str] = Query(None, description="Filter by product name (matches whole words)"),
+    name_prefix: Optional[str] = Query(None, min_length=1, description="Filter by product name prefix (case-sensitive)"),
     size: Optional[str] = Query(None, description="Filter by size (e.g., 'large')"),
     limit: int = Query(10, ge=1, le=100, description="Number of products to return"),
-    offset: int = Query(0, ge=0, description="Number of products to skip")
-) -> List[ProductOut]:
+    offset: int = Query(0, ge=0, description="Number of products to skip (ignored when 'after' is set)"),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    service: ProductService = Depends(get_product_service)
+) -> ORJSONResponse:
     """
     Retrieve a list of products with optional filtering and pagination.
     
     Query Parameters:
-        name: Optional name filter with regex support for partial matching
+        name: Optional name filter, matched by text search on whole words
+        name_prefix: Optional case-sensitive prefix the product name must start with
         size: Optional size filter to find products with specific size
         limit: Maximum number of products to return (1-100)
         offset: Number of products to skip for pagination
+        after: Cursor (last product ID of the previous page) for keyset pagination
         
     Returns:
-        List of products matching the criteria
+        List of products matching the criteria; when a full page is returned,
+        the X-Next-Cursor header holds the cursor for the next page
         
     Raises:
-        HTTPException: 500 if retrieval fails
+        HTTPException: 400 for an invalid cursor, 500 if retrieval fails
     """
     try:
-        logger.info(f"Listing products with filters - name: {name}, size: {size}")
+        logger.info(f"Listing products with filters - name: {name}, prefix: {name_prefix}, size: {size}")
         
-        service = ProductService()
-        pagination = PaginationParams(limit=limit, offset=offset)
+        pagination = PaginationParams(limit=limit, offset=offset, after=after)
         
         products = await service.list_products(
             name_filter=name,
+            prefix_filter=name_prefix,
             size_filter=size,
             pagination=pagination
         )
         
+        headers = {}
+        if len(products) == limit:
+            headers["X-Next-Cursor"] = products[-1]["_id"]
+        
         logger.info(f"Retrieved {len(products)} products")
-        return products
+        return ORJSONResponse(content=products, headers=headers)
         
+    except ValueError as e:
+        logger.warning(f"Product listing validation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Product listing failed: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -3,7 +3,7 @@ Pydantic schemas for product data validation and serialization.
 """
 
 from typing import List, Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from bson import ObjectId
 
 
@@ -30,11 +30,12 @@ class ProductIn(BaseModel):
     
     name: str = Field(..., min_length=1, max_length=200, description="Product name")
     price: float = Field(..., gt=0, description="Product price (must be positive)")
-    size: List[str] = Field(..., min_items=1, description="Available sizes")
+    size: List[str] = Field(..., min_length=1, description="Available sizes")
     available_quantity: int = Field(..., ge=0, description="Available quantity")
     
-    @validator('size')
-    def validate_sizes(cls, v):
+    @field_validator('size', mode='after')
+    @classmethod
+    def validate_sizes(cls, v: List[str]) -> List[str]:
         """Validate that sizes are non-empty strings."""
         if not v:
             raise ValueError("At least one size must be provided")
@@ -48,8 +49,9 @@ class ProductIn(BaseModel):
             
         return valid_sizes
     
-    @validator('name')
-    def validate_name(cls, v):
+    @field_validator('name', mode='after')
+    @classmethod
+    def validate_name(cls, v: str) -> str:
         """Validate and clean product name."""
         v = v.strip()
         if not v:
@@ -60,12 +62,11 @@ class ProductIn(BaseModel):
 class ProductOut(BaseModel):
     """Schema for product response data."""
     
+    model_config = ConfigDict(populate_by_name=True)
+    
     id: str = Field(alias="_id", description="Product ID")
     name: str = Field(..., description="Product name")
     price: float = Field(..., description="Product price")
     size: List[str] = Field(..., description="Available sizes")
     available_quantity: int = Field(..., description="Available quantity")
-    
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {ObjectId: str}
+
@@ -2,77 +2,204 @@
 Order service layer handling business logic and database operations.
 """
 
+import asyncio
 import logging
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone
 
 from bson import ObjectId
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError, OperationFailure
 
 from db import get_collection
 from schemas.order import OrderIn, OrderOut
-from services.product_service import ProductService
-from utils.pagination import PaginationParams
+from services.product_service import ProductService, get_product_service
+from utils.pagination import PaginationParams, decode_cursor
 
 logger = logging.getLogger(__name__)
 
+# Bound once so the create path skips the module/class attribute lookups
+_UTC = timezone.utc
+_now = datetime.now
+
+# Fields needed to build OrderOut (_id is always returned)
+ORDER_PROJECTION = {"user_id": 1, "product_id": 1, "quantity": 1, "created_at": 1}
+
+
+class OrderBatcher:
+    """
+    Coalesces concurrent order inserts into unordered bulk writes.
+    A lone queued order is written immediately; when several are queued, the
+    batch waits at most max_delay seconds to fill.
+    """
+
+    def __init__(self, max_batch_size: int = 100, max_delay: float = 0.01):
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._collection = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flush loop is active."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background flush loop. Call after the database is connected."""
+        if self.running:
+            return
+        self._collection = get_collection("orders")
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write out anything still queued."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        # Let an in-flight (or cancelled partial) batch finish before the connection closes
+        if self._flush_task is not None:
+            await self._flush_task
+            self._flush_task = None
+
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await self._flush(batch)
+
+    def submit(self, order_doc: dict) -> "asyncio.Future[ObjectId]":
+        """Queue an order document; the returned future resolves to its inserted _id."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((order_doc, future))
+        return future
+
+    async def _run(self) -> None:
+        """Collect queued orders into batches and flush them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                deadline = loop.time() + self.max_delay
+
+                while len(batch) < self.max_batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        remaining = deadline - loop.time()
+                        # Nothing else queued: waiting would only delay this order
+                        if len(batch) == 1 or remaining <= 0:
+                            break
+                        await asyncio.sleep(remaining)
+            finally:
+                # Also runs when cancelled mid-wait, so orders already dequeued are still written
+                self._flush_task = asyncio.ensure_future(self._flush(batch))
+
+            # Shielded so a shutdown mid-write leaves the insert running; stop() awaits it
+            await asyncio.shield(self._flush_task)
+
+    async def _flush(self, batch: List[Tuple[dict, asyncio.Future]]) -> None:
+        """Write one batch and resolve each submitter's future."""
+        for order_doc, _ in batch:
+            order_doc.setdefault("_id", ObjectId())
+
+        failed = {}
+        try:
+            await self._collection.bulk_write(
+                [InsertOne(order_doc) for order_doc, _ in batch], ordered=False
+            )
+        except BulkWriteError as e:
+            failed = {error["index"]: error for error in e.details.get("writeErrors", [])}
+        except Exception as e:
+            logger.error(f"Order batch insert failed: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for index, (order_doc, future) in enumerate(batch):
+            if future.done():  # Submitter was cancelled
+                continue
+            if index in failed:
+                future.set_exception(OperationFailure(failed[index].get("errmsg", "Order insert failed")))
+            else:
+                future.set_result(order_doc["_id"])
+
 
 class OrderService:
     """Service class for order operations."""
 
-    def __init__(self):
+    def __init__(self, product_service: ProductService, batcher: Optional[OrderBatcher] = None):
         self.collection = get_collection("orders")
-        self.product_service = ProductService()
+        self.product_service = product_service
+        self.batcher = batcher
 
     async def create_order(self, order: OrderIn) -> OrderOut:
         """
         Create a new order in the database.
-        Validates product existence and availability before creating the order.
+        Reserves stock with a single conditional update before inserting the order.
         """
         try:
-            logger.info(f"Validating product availability for product ID: {order.product_id}")
+            logger.info(f"Reserving quantity for product ID: {order.product_id}")
+            product_oid = ObjectId(order.product_id)  # Format already validated by OrderIn
 
-            product = await self.product_service.get_product_by_id(order.product_id)
+            # Atomically decrement stock only if enough is available
+            product = await self.product_service.decrement_and_fetch(
+                product_oid, order.quantity, projection={"_id": 1}
+            )
+
+            if product is None:
+                # Miss path only: find out whether the product exists at all
+                existing = await self.product_service.get_product_by_id(
+                    product_oid, projection={"available_quantity": 1}
+                )
 
-            if not product:
-                raise FileNotFoundError(f"Product with ID {order.product_id} not found")
+                if not existing:
+                    raise FileNotFoundError(f"Product with ID {order.product_id} not found")
 
-            if product["available_quantity"] < order.quantity:
                 raise ValueError(
-                    f"Insufficient quantity. Available: {product['available_quantity']}, Requested: {order.quantity}"
+                    f"Insufficient quantity. Available: {existing['available_quantity']}, Requested: {order.quantity}"
                 )
 
+            # product_id is stored as an ObjectId (12 bytes, same type as products._id).
+            # Orders written before this change hold the 24-char string form; convert them with
+            #   db.orders.find({product_id: {$type: "string"}}).forEach(o =>
+            #     db.orders.updateOne({_id: o._id}, {$set: {product_id: ObjectId(o.product_id)}}))
             order_doc = {
                 "user_id": order.user_id,
-                "product_id": order.product_id,
+                "product_id": product_oid,
                 "quantity": order.quantity,
-                "created_at": datetime.utcnow()
+                "created_at": _now(_UTC)
             }
 
             logger.info(f"Inserting order for user {order.user_id}")
-            result = await self.collection.insert_one(order_doc)
+            try:
+                if self.batcher is not None and self.batcher.running:
+                    inserted_id = await self.batcher.submit(order_doc)
+                else:
+                    inserted_id = (await self.collection.insert_one(order_doc)).inserted_id
+            except Exception:
+                logger.warning("Order insert failed — releasing reserved quantity")
+                await self.product_service.update_product_quantity(product_oid, order.quantity)
+                raise
 
-            if not result.inserted_id:
-                raise ValueError("Failed to create order")
-
-            logger.info(f"Updating product quantity for product ID: {order.product_id}")
-            quantity_updated = await self.product_service.update_product_quantity(
-                order.product_id, -order.quantity
-            )
-
-            if not quantity_updated:
-                logger.warning("Product quantity update failed — rolling back order")
-                await self.collection.delete_one({"_id": result.inserted_id})
-                raise ValueError("Failed to update product quantity")
-
-            created_order = await self.collection.find_one({"_id": result.inserted_id})
-            logger.info(f"Order successfully created with ID: {created_order['_id']}")
+            logger.info(f"Order successfully created with ID: {inserted_id}")
 
             return OrderOut(
-                _id=str(created_order["_id"]),
-                user_id=created_order["user_id"],
-                product_id=created_order["product_id"],
-                quantity=created_order["quantity"],
-                created_at=created_order["created_at"]
+                _id=str(inserted_id),
+                user_id=order_doc["user_id"],
+                product_id=str(order_doc["product_id"]),
+                quantity=order_doc["quantity"],
+                created_at=order_doc["created_at"]
             )
 
         except (ValueError, FileNotFoundError):
@@ -87,30 +214,45 @@ class OrderService:
         pagination: Optional[PaginationParams] = None
     ) -> List[OrderOut]:
         """
-        Retrieve orders for a specific user with pagination.
+        Retrieve orders for a specific user, newest first.
+        Uses keyset pagination when pagination.after holds a cursor, offset otherwise.
         """
         try:
             logger.info(f"Fetching orders for user: {user_id}")
             query = {"user_id": user_id}
-            cursor = self.collection.find(query).sort("created_at", -1)
+
+            if pagination and pagination.after:
+                # Seek past the last (created_at, _id) of the previous page
+                created_at, last_id = decode_cursor(pagination.after)
+                query["$or"] = [
+                    {"created_at": {"$lt": created_at}},
+                    {"created_at": created_at, "_id": {"$lt": last_id}}
+                ]
+
+            cursor = self.collection.find(query, projection=ORDER_PROJECTION).sort(
+                [("created_at", -1), ("_id", -1)]
+            )
 
             if pagination:
-                cursor = cursor.skip(pagination.offset).limit(pagination.limit)
+                if not pagination.after:
+                    cursor = cursor.skip(pagination.offset)
+                cursor = cursor.limit(pagination.limit)
 
-            orders = await cursor.to_list(length=None)
+            orders = await cursor.to_list(length=pagination.limit if pagination else 100)
             logger.info(f"Found {len(orders)} orders for user {user_id}")
 
+            # Documents come from our own collection, so skip re-validation
             return [
-                OrderOut(
-                    _id=str(order["_id"]),
-                    user_id=order["user_id"],
-                    product_id=order["product_id"],
-                    quantity=order["quantity"],
-                    created_at=order["created_at"]
+                OrderOut.model_construct(
+                    id=str(order["_id"]),
+                    product_id=str(order["product_id"]),
+                    **{field: order[field] for field in ("user_id", "quantity", "created_at")}
                 )
                 for order in orders
             ]
 
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error listing orders for user {user_id}: {str(e)}", exc_info=True)
             raise
@@ -130,3 +272,20 @@ class OrderService:
         except Exception as e:
             logger.error(f"Error retrieving order {order_id}: {str(e)}", exc_info=True)
             raise
+
+
+_instance: Optional[OrderService] = None
+_batcher = OrderBatcher()
+
+
+def get_order_batcher() -> OrderBatcher:
+    """Return the process-wide order batcher (started and stopped by the app lifespan)."""
+    return _batcher
+
+
+def get_order_service() -> OrderService:
+    """Return the shared OrderService, created on first use after the DB is connected."""
+    global _instance
+    if _instance is None:
+        _instance = OrderService(get_product_service(), get_order_batcher())
+    return _instance
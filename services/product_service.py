@@ -2,12 +2,17 @@
 Product service layer handling business logic and database operations.
 """
 
+import asyncio
 import logging
-from typing import List, Optional
-from datetime import datetime
+import re
+from typing import Dict, List, Optional, Union
+from datetime import datetime, timezone
 
 from bson import ObjectId
-from pymongo.errors import DuplicateKeyError
+from bson.errors import InvalidId
+from cachetools import TTLCache
+from pymongo import ReadPreference, ReturnDocument, WriteConcern
+from pymongo.errors import PyMongoError
 
 from db import get_collection
 from schemas.product import ProductIn, ProductOut
@@ -15,12 +20,47 @@ from utils.pagination import PaginationParams
 
 logger = logging.getLogger(__name__)
 
+# Fields needed to build ProductOut (_id is always returned)
+PRODUCT_PROJECTION = {"name": 1, "price": 1, "size": 1, "available_quantity": 1}
+
+# Listing cache: entry cap and seconds an entry may be served
+LIST_CACHE_SIZE = 1024
+LIST_CACHE_TTL = 30
+
+
+def _parse_oid(value: Union[str, ObjectId]) -> Optional[ObjectId]:
+    """Parse an ID in a single pass; None if it is not a valid ObjectId."""
+    if isinstance(value, ObjectId):
+        return value
+    if not isinstance(value, str):
+        return None  # ObjectId(None) would mint a new ID rather than fail
+    try:
+        return ObjectId(value)
+    except InvalidId:
+        return None
+
 
 class ProductService:
     """Service class for product operations."""
     
     def __init__(self):
         self.collection = get_collection("products")
+        # Catalog create/browse only: acknowledged by the primary alone (w=1); a create
+        # lost in a failover can be resubmitted. Stock changes keep the client defaults.
+        self._catalog = self.collection.with_options(write_concern=WriteConcern(w=1))
+        # Uncached listings may read from the nearest member. Cache-filling reads stay on
+        # the primary: a lagging secondary would otherwise pin stale rows for the whole TTL.
+        self._catalog_nearest = self._catalog.with_options(read_preference=ReadPreference.NEAREST)
+        # Listings keyed by (catalog version, filters, page); bumping the version on
+        # any write makes older entries unreachable until the TTL evicts them.
+        # No lock needed: lookups and stores never span an await.
+        self._list_cache: TTLCache = TTLCache(maxsize=LIST_CACHE_SIZE, ttl=LIST_CACHE_TTL)
+        self._catalog_version = 0
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+    
+    def invalidate_cache(self) -> None:
+        """Invalidate cached listings after any change to product data."""
+        self._catalog_version += 1
     
     async def create_product(self, product: ProductIn) -> ProductOut:
         """
@@ -36,140 +76,283 @@ class ProductService:
             ValueError: If product data is invalid
         """
         try:
-            # Prepare product document
+            # Prepare product document (one timestamp for both fields)
+            now = datetime.now(timezone.utc)
             product_doc = {
                 "name": product.name,
                 "price": product.price,
                 "size": product.size,
                 "available_quantity": product.available_quantity,
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
+                "created_at": now,
+                "updated_at": now
             }
             
             # Insert into database
-            result = await self.collection.insert_one(product_doc)
+            result = await self._catalog.insert_one(product_doc)
             
             if not result.inserted_id:
                 raise ValueError("Failed to create product")
             
-            # Retrieve and return the created product
-            created_product = await self.collection.find_one({"_id": result.inserted_id})
+            self.invalidate_cache()
             
+            # Build the response from what was written instead of reading it back
             return ProductOut(
-                _id=str(created_product["_id"]),
-                name=created_product["name"],
-                price=created_product["price"],
-                size=created_product["size"],
-                available_quantity=created_product["available_quantity"]
+                _id=result.inserted_id.binary.hex(),
+                name=product.name,
+                price=product.price,
+                size=product.size,
+                available_quantity=product.available_quantity
             )
             
-        except Exception as e:
-            logger.error(f"Error creating product: {str(e)}")
+        except PyMongoError as e:
+            logger.error("Error creating product: %s", e)
             raise
     
     async def list_products(
         self,
         name_filter: Optional[str] = None,
+        prefix_filter: Optional[str] = None,
         size_filter: Optional[str] = None,
         pagination: Optional[PaginationParams] = None
-    ) -> List[ProductOut]:
+    ) -> List[dict]:
         """
         Retrieve products with optional filtering and pagination.
         
         Args:
-            name_filter: Optional name filter with regex support
+            name_filter: Optional name filter (text search on whole words)
+            prefix_filter: Optional case-sensitive name prefix
             size_filter: Optional size filter
-            pagination: Pagination parameters
+            pagination: Pagination parameters; pagination.after (a product ID)
+                switches from offset to _id keyset pagination
             
         Returns:
-            List of products matching criteria
+            Products matching criteria, as dicts shaped like ProductOut
+            
+        Raises:
+            ValueError: If pagination.after is not a valid product ID
         """
-        try:
-            # Build query filters
-            query = {}
-            
-            if name_filter:
-                # Support partial/regex search for name
-                query["name"] = {"$regex": name_filter, "$options": "i"}
-            
-            if size_filter:
-                # Filter products that have the specified size
-                query["size"] = {"$in": [size_filter.lower()]}
-            
-            # Create cursor with query
-            cursor = self.collection.find(query)
-            
-            # Apply pagination
-            if pagination:
-                cursor = cursor.skip(pagination.offset).limit(pagination.limit)
-            
-            # Sort by _id for consistent pagination
-            cursor = cursor.sort("_id", 1)
-            
-            # Fetch results
-            products = await cursor.to_list(length=None)
-            
-            # Convert to response models
-            return [
-                ProductOut(
-                    _id=str(product["_id"]),
-                    name=product["name"],
-                    price=product["price"],
-                    size=product["size"],
-                    available_quantity=product["available_quantity"]
-                )
-                for product in products
-            ]
-            
-        except Exception as e:
-            logger.error(f"Error listing products: {str(e)}")
-            raise
+        # Prefix filters are open-ended user input; caching them would mostly churn the cache
+        if prefix_filter:
+            return await self._query_products(name_filter, prefix_filter, size_filter, pagination)
+        
+        cache_key = (
+            self._catalog_version,
+            name_filter,
+            size_filter,
+            pagination.offset if pagination else None,
+            pagination.limit if pagination else None,
+            pagination.after if pagination else None
+        )
+        cached = self._list_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
+        # Single flight: concurrent misses for the same key share one query task.
+        # Every caller, the first included, awaits it shielded, so a client that
+        # disconnects only cancels its own wait, never the query or the other waiters.
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fill_list_cache(cache_key, name_filter, size_filter, pagination)
+            )
+            self._inflight[cache_key] = task
+            task.add_done_callback(
+                lambda t: self._inflight.pop(cache_key) if self._inflight.get(cache_key) is t else None
+            )
+            # Mark the outcome as retrieved even when every caller has gone
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        
+        return list(await asyncio.shield(task))
+    
+    async def _fill_list_cache(
+        self,
+        cache_key: tuple,
+        name_filter: Optional[str],
+        size_filter: Optional[str],
+        pagination: Optional[PaginationParams]
+    ) -> List[dict]:
+        """Run an uncached listing and store it under cache_key."""
+        products = await self._query_products(name_filter, None, size_filter, pagination)
+        self._list_cache[cache_key] = products
+        return products
+    
+    async def _query_products(
+        self,
+        name_filter: Optional[str],
+        prefix_filter: Optional[str],
+        size_filter: Optional[str],
+        pagination: Optional[PaginationParams]
+    ) -> List[dict]:
+        """Run the listing query against MongoDB (uncached)."""
+        # Build query filters
+        query = {}
+        
+        if name_filter:
+            # Word search served by the text index on name (an unanchored regex scans every document)
+            query["$text"] = {"$search": name_filter}
+        
+        if prefix_filter:
+            if prefix_filter.isascii() and prefix_filter.isalnum():
+                # Plain range on the name index, no regex engine involved. The exclusive
+                # bound bumps the last character, so names continuing with any code point
+                # (MongoDB compares UTF-8 bytes) still fall inside the range.
+                upper = prefix_filter[:-1] + chr(ord(prefix_filter[-1]) + 1)
+                query["name"] = {"$gte": prefix_filter, "$lt": upper}
+            else:
+                # Anchored, case-sensitive regex becomes a range scan on the name index
+                query["name"] = {"$regex": "^" + re.escape(prefix_filter)}
+        
+        if size_filter:
+            # Filter products that have the specified size
+            query["size"] = {"$in": [size_filter.lower()]}
+        
+        if pagination and pagination.after:
+            # Seek past the last _id of the previous page instead of skipping
+            after_oid = _parse_oid(pagination.after)
+            if after_oid is None:
+                raise ValueError("Invalid pagination cursor")
+            query["_id"] = {"$gt": after_oid}
+        
+        # Create cursor with query (prefix listings are never cached, so they may read nearest)
+        collection = self._catalog_nearest if prefix_filter else self._catalog
+        cursor = collection.find(query, projection=PRODUCT_PROJECTION)
+        
+        # Apply pagination
+        if pagination:
+            if not pagination.after:
+                cursor = cursor.skip(pagination.offset)
+            # Whole page in a single server batch
+            cursor = cursor.limit(pagination.limit).batch_size(pagination.limit)
+        
+        # Sort by _id for consistent pagination
+        cursor = cursor.sort("_id", 1)
+        
+        # Build response rows as documents arrive (no intermediate list of raw documents).
+        # Plain dicts in ProductOut's wire shape: the router hands them straight to orjson.
+        products = []
+        async for product in cursor:
+            products.append({
+                "_id": product["_id"].binary.hex(),  # Same 24-char hex as str(), minus the dispatch
+                "name": product["name"],
+                "price": product["price"],
+                "size": product["size"],
+                "available_quantity": product["available_quantity"]
+            })
+        
+        return products
     
-    async def get_product_by_id(self, product_id: str) -> Optional[dict]:
+    async def get_product_by_id(
+        self,
+        product_id: Union[str, ObjectId],
+        projection: Optional[dict] = None
+    ) -> Optional[dict]:
         """
         Retrieve a product by its ID.
         
         Args:
-            product_id: Product ID to search for
+            product_id: Product ID to search for (string or already-parsed ObjectId)
+            projection: Optional fields to return (full document if omitted)
             
         Returns:
             Product document if found, None otherwise
         """
+        product_oid = _parse_oid(product_id)
+        if product_oid is None:
+            return None
+        
+        return await self.collection.find_one({"_id": product_oid}, projection)
+    
+    async def decrement_and_fetch(
+        self,
+        product_id: Union[str, ObjectId],
+        quantity: int,
+        projection: Optional[dict] = None
+    ) -> Optional[dict]:
+        """
+        Atomically reserve stock and return the updated product in one round trip.
+        
+        Args:
+            product_id: Product ID to decrement (string or already-parsed ObjectId)
+            quantity: Units to take; only applied if at least this many are available
+            projection: Optional fields to return (full document if omitted)
+            
+        Returns:
+            Product document after the decrement, or None if the product does not
+            exist or has insufficient stock
+        """
         try:
-            if not ObjectId.is_valid(product_id):
+            product_oid = _parse_oid(product_id)
+            if product_oid is None:
                 return None
-                
-            return await self.collection.find_one({"_id": ObjectId(product_id)})
             
-        except Exception as e:
-            logger.error(f"Error retrieving product {product_id}: {str(e)}")
+            product = await self.collection.find_one_and_update(
+                {"_id": product_oid, "available_quantity": {"$gte": quantity}},
+                {
+                    "$inc": {"available_quantity": -quantity},
+                    "$set": {"updated_at": datetime.now(timezone.utc)}
+                },
+                projection=projection,
+                return_document=ReturnDocument.AFTER
+            )
+            
+            if product is not None:
+                self.invalidate_cache()
+            
+            return product
+            
+        except PyMongoError as e:
+            logger.error("Error decrementing product quantity: %s", e)
             raise
     
-    async def update_product_quantity(self, product_id: str, quantity_change: int) -> bool:
+    async def update_product_quantity(
+        self,
+        product_id: Union[str, ObjectId],
+        quantity_change: int
+    ) -> bool:
         """
         Update product available quantity (for order processing).
         
         Args:
-            product_id: Product ID to update
+            product_id: Product ID to update (string or already-parsed ObjectId)
             quantity_change: Change in quantity (negative for orders)
             
         Returns:
-            True if update was successful, False otherwise
+            True if update was successful, False otherwise (including an invalid ID)
         """
         try:
+            product_oid = _parse_oid(product_id)
+            if product_oid is None:
+                return False
+            
+            query = {"_id": product_oid}
+            if quantity_change < 0:
+                # Only decrements need the stock guard; restocks always apply
+                query["available_quantity"] = {"$gte": -quantity_change}
+            
             result = await self.collection.update_one(
-                {
-                    "_id": ObjectId(product_id),
-                    "available_quantity": {"$gte": abs(quantity_change) if quantity_change < 0 else 0}
-                },
+                query,
                 {
                     "$inc": {"available_quantity": quantity_change},
-                    "$set": {"updated_at": datetime.utcnow()}
+                    "$set": {"updated_at": datetime.now(timezone.utc)}
                 }
             )
             
+            if result.modified_count:
+                self.invalidate_cache()
+            
             return result.modified_count > 0
             
-        except Exception as e:
-            logger.error(f"Error updating product quantity: {str(e)}")
+        except PyMongoError as e:
+            logger.error("Error updating product quantity: %s", e)
             raise
+
+
+_instance: Optional[ProductService] = None
+
+
+def get_product_service() -> ProductService:
+    """Return the shared ProductService, created on first use after the DB is connected."""
+    global _instance
+    if _instance is None:
+        _instance = ProductService()
+    return _instance
@@ -1,5 +1,9 @@
-import os
 import re
+from pathlib import Path
+
+# A single-line typing import of bare names that does not already import Optional.
+# Parenthesized, continued or commented imports are left alone: appending there breaks syntax.
+TYPING_IMPORT_RE = re.compile(r'^from typing import (?!.*\bOptional\b)([\w ,]*\w)[ \t]*$', re.MULTILINE)
 
 files_to_fix = [
     "services/order_service.py",
@@ -12,21 +16,24 @@ files_to_fix = [
 ]
 
 for file_path in files_to_fix:
-    if os.path.exists(file_path):
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
-        # Add Optional to typing imports if missing
-        if 'from typing import' in content and 'Optional' not in content:
-            content = re.sub(
-                r'from typing import ([^Optional\n]*)\n',
-                r'from typing import \1, Optional\n',
-                content
-            )
-        
-        with open(file_path, 'w') as f:
-            f.write(content)
-        
-        print(f"Fixed imports in {file_path}")
-    else:
+    path = Path(file_path)
+    if not path.exists():
         print(f"File not found: {file_path}")
+        continue
+    
+    content = path.read_text()
+    
+    # Substring checks first: they settle most files without running the regex
+    if 'from typing import' not in content or 'Optional' in content:
+        print(f"Imports already correct in {file_path}")
+        continue
+    
+    # Add Optional to typing imports if missing
+    new_content, replacements = TYPING_IMPORT_RE.subn(r'from typing import \1, Optional', content)
+    if not replacements:
+        print(f"No single-line typing import to extend in {file_path}; add Optional by hand")
+        continue
+    
+    # Only changed files are rewritten, so untouched files keep their mtime
+    path.write_text(new_content)
+    print(f"Fixed imports in {file_path}")
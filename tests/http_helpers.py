@@ -0,0 +1,62 @@
+"""
+HTTP helpers shared by the API test scripts (comprehensive suite and health validator)
+"""
+
+import asyncio
+import contextlib
+import time
+from typing import Any, Optional, Tuple
+
+import httpx
+import orjson
+
+# Transient gateway responses (a cold-starting deployment answers these at first) retried
+# by request_with_retries, for idempotent methods only (a POST may already have created
+# its product or order), after RETRY_BACKOFF seconds doubling per attempt
+RETRY_STATUSES = frozenset({502, 503, 504})
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+RETRY_BACKOFF = 0.2
+STATUS_RETRIES = 3
+
+# Statuses that never carry a body (RFC 9110)
+BODILESS_STATUSES = frozenset({204, 304})
+
+
+def decode_body(response: httpx.Response) -> Any:
+    """Parse a response body: JSON when it parses, text otherwise, None when there is none"""
+    # Bodiless responses are known from the status line and headers alone
+    if (response.status_code in BODILESS_STATUSES
+            or response.headers.get("content-length") == "0"
+            or not response.content):
+        return None
+
+    # Parse straight from bytes (non-JSON bodies fall back to text)
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        return response.text
+
+
+async def request_with_retries(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    slots: Optional[asyncio.Semaphore] = None,
+    **kwargs
+) -> Tuple[httpx.Response, int]:
+    """
+    Send a request, retrying transient gateway statuses on idempotent methods.
+    
+    Each attempt holds one of slots (if given) only while in flight, not during backoff.
+    Returns the last response and that attempt's duration in ns; transport errors propagate.
+    """
+    for attempt in range(STATUS_RETRIES + 1):
+        async with slots or contextlib.nullcontext():
+            start_ns = time.perf_counter_ns()  # Started after the slot, so queueing isn't billed as latency
+            response = await client.request(method, url, **kwargs)
+            elapsed_ns = time.perf_counter_ns() - start_ns
+        
+        if (response.status_code not in RETRY_STATUSES or method not in RETRY_METHODS
+                or attempt == STATUS_RETRIES):
+            return response, elapsed_ns
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
@@ -1,29 +1,83 @@
+"""
+MongoDB connectivity smoke test.
+
+Runs under pytest (skipped when MONGODB_URI is unset) or directly with
+`python tests/test_db.py [--verbose]`; both go through one pooled client from
+get_client(). --verbose also lists the database's collections.
+"""
+
+import argparse
 import asyncio
 import os
+from typing import Optional
+
+import pytest
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient
 
-async def test_connection():
-    load_dotenv()
+load_dotenv()
+
+_client: Optional[AsyncIOMotorClient] = None
+
+
+def get_client() -> AsyncIOMotorClient:
+    """Return the shared, pooled client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(
+            os.getenv("MONGODB_URI"),
+            maxPoolSize=50,
+            minPoolSize=5,
+            serverSelectionTimeoutMS=3_000
+        )
+    return _client
+
+
+def close_client() -> None:
+    """Close the shared client; the next get_client() call opens a new one."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+@pytest.fixture(scope="session")
+def mongo_client():
+    if not os.getenv("MONGODB_URI"):
+        pytest.skip("MONGODB_URI is not set")
+    yield get_client()
+    close_client()
+
+
+@pytest.mark.asyncio
+async def test_connection(mongo_client: AsyncIOMotorClient, verbose: bool = False):
+    print(f"Connecting to: {os.getenv('MONGODB_URI', '')[:50]}...")
     
-    mongo_uri = os.getenv("MONGODB_URI")
-    print(f"Connecting to: {mongo_uri[:50]}...")
+    # Test connection
+    await mongo_client.admin.command('ping')
+    print("✅ MongoDB connection successful!")
     
-    try:
-        client = AsyncIOMotorClient(mongo_uri)
-        # Test connection
-        await client.admin.command('ping')
-        print("✅ MongoDB connection successful!")
-        
-        # Test database access
-        db = client[os.getenv("DATABASE_NAME", "ecommerce")]
+    # Test database access: one _id-only read needs read rights on the database (unlike
+    # ping or hello) and costs the same however many collections it holds
+    db = mongo_client[os.getenv("DATABASE_NAME", "ecommerce")]
+    await db.products.find_one({}, projection={"_id": 1})
+    print("✅ Database accessible (products readable)")
+    
+    if verbose:
         collections = await db.list_collection_names()
-        print(f"✅ Database accessible. Collections: {collections}")
-        
+        print(f"   Collections: {collections}")
+
+
+async def main(verbose: bool = False):
+    try:
+        await test_connection(get_client(), verbose=verbose)
     except Exception as e:
         print(f"❌ Connection failed: {e}")
     finally:
-        client.close()
+        close_client()
+
 
-# Run the test
-asyncio.run(test_connection())
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MongoDB connectivity smoke test")
+    parser.add_argument("--verbose", action="store_true", help="also list the database's collections")
+    asyncio.run(main(parser.parse_args().verbose))
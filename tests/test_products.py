@@ -2,79 +2,92 @@
 Test suite for product endpoints.
 """
 
+import asyncio
+
 import pytest
+import pytest_asyncio
 from httpx import AsyncClient
 from fastapi.testclient import TestClient
 
 from main import app
 
 
+@pytest.fixture(scope="module")
+def event_loop():
+    """One event loop for the module, so the module-scoped client can be shared."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def client():
+    """One AsyncClient (and connection setup) shared by every test in the module."""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
 @pytest.mark.asyncio
 class TestProducts:
     """Test cases for product endpoints."""
     
-    async def test_create_product_success(self):
+    async def test_create_product_success(self, client):
         """Test successful product creation."""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            product_data = {
-                "name": "Test Product",
-                "price": 99.99,
-                "size": ["small", "medium", "large"],
-                "available_quantity": 100
-            }
-            
-            response = await client.post("/products", json=product_data)
-            
-            assert response.status_code == 201
-            data = response.json()
-            assert data["name"] == product_data["name"]
-            assert data["price"] == product_data["price"]
-            assert "id" in data
+        product_data = {
+            "name": "Test Product",
+            "price": 99.99,
+            "size": ["small", "medium", "large"],
+            "available_quantity": 100
+        }
+        
+        response = await client.post("/products", json=product_data)
+        
+        assert response.status_code == 201
+        data = response.json()
+        assert data["name"] == product_data["name"]
+        assert data["price"] == product_data["price"]
+        assert "id" in data
     
-    async def test_create_product_invalid_data(self):
+    async def test_create_product_invalid_data(self, client):
         """Test product creation with invalid data."""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            invalid_data = {
-                "name": "",  # Empty name
-                "price": -10,  # Negative price
-                "size": [],  # Empty size array
-                "available_quantity": -5  # Negative quantity
-            }
-            
-            response = await client.post("/products", json=invalid_data)
-            assert response.status_code == 400
+        invalid_data = {
+            "name": "",  # Empty name
+            "price": -10,  # Negative price
+            "size": [],  # Empty size array
+            "available_quantity": -5  # Negative quantity
+        }
+        
+        response = await client.post("/products", json=invalid_data)
+        assert response.status_code == 400
     
-    async def test_list_products_success(self):
+    async def test_list_products_success(self, client):
         """Test successful product listing."""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            response = await client.get("/products")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert isinstance(data, list)
+        response = await client.get("/products")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert isinstance(data, list)
     
-    async def test_list_products_with_filters(self):
+    async def test_list_products_with_filters(self, client):
         """Test product listing with filters."""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            # Test name filter
-            response = await client.get("/products?name=test")
-            assert response.status_code == 200
-            
-            # Test size filter
-            response = await client.get("/products?size=large")
-            assert response.status_code == 200
-            
-            # Test pagination
-            response = await client.get("/products?limit=5&offset=10")
-            assert response.status_code == 200
+        # Name filter, size filter and pagination are independent requests
+        name_response, size_response, page_response = await asyncio.gather(
+            client.get("/products?name=test"),
+            client.get("/products?size=large"),
+            client.get("/products?limit=5&offset=10")
+        )
+        
+        assert name_response.status_code == 200
+        assert size_response.status_code == 200
+        assert page_response.status_code == 200
     
-    async def test_list_products_pagination_limits(self):
+    async def test_list_products_pagination_limits(self, client):
         """Test pagination parameter limits."""
-        async with AsyncClient(app=app, base_url="http://test") as client:
-            # Test limit too high
-            response = await client.get("/products?limit=1000")
-            assert response.status_code == 422
-            
-            # Test negative offset
-            response = await client.get("/products?offset=-1")
-            assert response.status_code == 422
+        # Limit too high and negative offset, checked concurrently
+        limit_response, offset_response = await asyncio.gather(
+            client.get("/products?limit=1000"),
+            client.get("/products?offset=-1")
+        )
+        
+        assert limit_response.status_code == 422
+        assert offset_response.status_code == 422
@@ -2,15 +2,41 @@
 Pagination utilities for consistent pagination across the application.
 """
 
-from typing import Optional
-from pydantic import BaseModel, Field
+import base64
+import functools
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Tuple
 
+from bson import ObjectId
 
-class PaginationParams(BaseModel):
-    """Pagination parameters with validation."""
+# Bounds for limit (the routers enforce the same range on the limit query parameter)
+MIN_LIMIT = 1
+MAX_LIMIT = 100
+
+
+@dataclass(slots=True, frozen=True)
+class PaginationParams:
+    """
+    Pagination parameters with validation.
+    
+    Built per request from query values FastAPI has already validated, so this is a
+    slotted dataclass with plain bounds checks rather than a Pydantic model.
+    
+    Raises:
+        ValueError: If limit or offset is out of range
+    """
     
-    limit: int = Field(default=10, ge=1, le=100, description="Number of items to return")
-    offset: int = Field(default=0, ge=0, description="Number of items to skip")
+    limit: int = 10  # Number of items to return
+    offset: int = 0  # Number of items to skip
+    after: Optional[str] = None  # Cursor returned by the previous page
+    
+    def __post_init__(self) -> None:
+        if not MIN_LIMIT <= self.limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between {MIN_LIMIT} and {MAX_LIMIT}")
+        if self.offset < 0:
+            raise ValueError("offset must not be negative")
     
     @property
     def skip(self) -> int:
@@ -18,25 +44,32 @@ class PaginationParams(BaseModel):
         return self.offset
 
 
-class PaginationMeta(BaseModel):
+@dataclass(slots=True, frozen=True)
+class PaginationMeta:
     """Pagination metadata for responses."""
     
-    total: int = Field(..., description="Total number of items")
-    limit: int = Field(..., description="Items per page")
-    offset: int = Field(..., description="Items skipped")
-    has_next: bool = Field(..., description="Whether there are more items")
-    has_previous: bool = Field(..., description="Whether there are previous items")
+    total: int  # Total number of items
+    limit: int  # Items per page
+    offset: int  # Items skipped
+    has_next: bool  # Whether there are more items
+    has_previous: bool  # Whether there are previous items
     
     @classmethod
     def create(cls, total: int, pagination: PaginationParams) -> "PaginationMeta":
         """Create pagination metadata from total count and parameters."""
-        return cls(
-            total=total,
-            limit=pagination.limit,
-            offset=pagination.offset,
-            has_next=pagination.offset + pagination.limit < total,
-            has_previous=pagination.offset > 0
-        )
+        return _meta_cached(total, pagination.limit, pagination.offset)
+
+
+@functools.lru_cache(maxsize=256)
+def _meta_cached(total: int, limit: int, offset: int) -> PaginationMeta:
+    """Build (once per shape) the metadata for a page; frozen, so instances are shared safely."""
+    return PaginationMeta(
+        total=total,
+        limit=limit,
+        offset=offset,
+        has_next=offset + limit < total,
+        has_previous=offset > 0
+    )
 
 
 def calculate_skip_limit(
@@ -56,6 +89,9 @@ def calculate_skip_limit(
         
     Returns:
         PaginationParams with calculated offset and limit
+        
+    Raises:
+        ValueError: If the resulting offset or limit is out of range
     """
     if page is not None and per_page is not None:
         # Convert page-based pagination to offset-based
@@ -67,3 +103,32 @@ def calculate_skip_limit(
         calculated_limit = limit or 10
     
     return PaginationParams(offset=calculated_offset, limit=calculated_limit)
+
+
+def encode_cursor(created_at: datetime, object_id: str) -> str:
+    """
+    Encode the sort key of the last item on a page into an opaque cursor.
+    
+    Args:
+        created_at: Creation timestamp of the last item
+        object_id: ID of the last item (tiebreaker for equal timestamps)
+        
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"created_at": created_at.isoformat(), "_id": object_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(payload["created_at"]), ObjectId(payload["_id"])
+    except Exception:
+        raise ValueError("Invalid pagination cursor")